@@ -1,15 +1,13 @@
 """
 Django settings for richie project.
 """
+import functools
 import json
 import os
 
 from django.utils.translation import gettext_lazy as _
 
-# pylint: disable=ungrouped-imports
-import sentry_sdk
 from configurations import Configuration, values
-from sentry_sdk.integrations.django import DjangoIntegration
 
 from richie.apps.courses.settings.mixins import RichieCoursesConfigurationMixin
 
@@ -17,12 +15,15 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join("/", "data")
 
 
+@functools.lru_cache(maxsize=1)
 def get_release():
     """Get the current release of the application.
 
     By release, we mean the release from the version.json file à la Mozilla [1]
     (if any). If this file has not been found, it defaults to "NA".
 
+    The result is cached so that the version file is only read once per process.
+
     [1]
     https://github.com/mozilla-services/Dockerflow/blob/master/docs/version_object.md
     """
@@ -131,6 +132,7 @@ class Base(StyleguideMixin, DRFMixin, RichieCoursesConfigurationMixin, Configura
     * DB_HOST
     * DB_PASSWORD
     * DB_USER
+    * DB_CONN_MAX_AGE
     """
 
     DEBUG = False
@@ -175,6 +177,9 @@ class Base(StyleguideMixin, DRFMixin, RichieCoursesConfigurationMixin, Configura
                 "localhost", environ_name="DB_HOST", environ_prefix=None
             ),
             "PORT": values.Value(5432, environ_name="DB_PORT", environ_prefix=None),
+            "CONN_MAX_AGE": values.IntegerValue(
+                0, environ_name="DB_CONN_MAX_AGE", environ_prefix=None
+            ),
         }
     }
     DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
@@ -585,6 +590,12 @@ class Base(StyleguideMixin, DRFMixin, RichieCoursesConfigurationMixin, Configura
 
         # The SENTRY_DSN setting should be available to activate sentry for an environment
         if cls.SENTRY_DSN is not None:
+            # Sentry is imported lazily so that environments in which it is not
+            # activated don't pay for its import on startup
+            # pylint: disable=import-outside-toplevel
+            import sentry_sdk
+            from sentry_sdk.integrations.django import DjangoIntegration
+
             sentry_sdk.init(  # pylint: disable=abstract-class-instantiated
                 dsn=cls.SENTRY_DSN,
                 environment=cls._get_environment(),
@@ -670,6 +681,34 @@ class Production(Base):
         "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
     )
 
+    # Keep database connections open between requests instead of opening a new
+    # connection for each request
+    DATABASES = {
+        "default": {
+            **Base.DATABASES["default"],
+            "CONN_MAX_AGE": values.IntegerValue(
+                600, environ_name="DB_CONN_MAX_AGE", environ_prefix=None
+            ),
+        }
+    }
+
+    # Templates are not modified at runtime in production, so we can cache them
+    # in memory instead of looking them up on the filesystem for each request
+    TEMPLATES = [
+        {
+            **Base.TEMPLATES[0],
+            "OPTIONS": {
+                **Base.TEMPLATES[0]["OPTIONS"],
+                "loaders": [
+                    (
+                        "django.template.loaders.cached.Loader",
+                        Base.TEMPLATES[0]["OPTIONS"]["loaders"],
+                    )
+                ],
+            },
+        }
+    ]
+
     # For more details about CMS_CACHE_DURATION, see :
     # http://docs.django-cms.org/en/latest/reference/configuration.html#cms-cache-durations
     CMS_CACHE_DURATIONS = values.DictValue(
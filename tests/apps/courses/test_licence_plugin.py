@@ -1,8 +1,6 @@
 """
 Licence plugin tests
 """
-from django.db import transaction
-
 from cms.api import add_plugin
 from cms.models import Placeholder
 
@@ -15,86 +13,87 @@ from richie.apps.courses.factories import LicenceFactory
 class LicencePluginTestCase(CMSPluginTestCase):
     """Licence plugin tests case"""
 
-    @transaction.atomic
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Licences and their plugins are not modified when rendering so they can be
+        created once for the whole test case. Each plugin lives in its own dummy
+        placeholder so that rendering a placeholder only renders one licence.
+        """
+        super().setUpTestData()
+        # Create random values for parameters with a factory
+        cls.licence = LicenceFactory(url="https://example.com")
+        cls.placeholder = Placeholder.objects.create(slot="test")
+        cls.model_instance = add_plugin(
+            cls.placeholder, LicencePlugin, "en", licence=cls.licence
+        )
+
+        # Licence with an empty url to simplify render of tested HTML
+        cls.licence_without_url = LicenceFactory(url="")
+        cls.placeholder_without_url = Placeholder.objects.create(slot="test")
+        add_plugin(
+            cls.placeholder_without_url,
+            LicencePlugin,
+            "en",
+            licence=cls.licence_without_url,
+        )
+
     def test_licence_plugin_context_and_html(self):
         """
         Instanciating this plugin with an instance should populate the context
         and render in the template.
         """
-        placeholder = Placeholder.objects.create(slot="test")
-
-        # Create random values for parameters with a factory
-        licence = LicenceFactory()
-
-        model_instance = add_plugin(placeholder, LicencePlugin, "en", licence=licence)
-        plugin_instance = model_instance.get_plugin_class_instance()
-        plugin_context = plugin_instance.render({}, model_instance, None)
+        plugin_instance = self.model_instance.get_plugin_class_instance()
+        plugin_context = plugin_instance.render({}, self.model_instance, None)
 
         # Check if "instance" is in plugin context
         self.assertIn("instance", plugin_context)
 
         # Check if parameters, generated by the factory, are correctly set in
         # "instance" of plugin context
-        self.assertEqual(plugin_context["instance"].licence.name, licence.name)
+        self.assertEqual(plugin_context["instance"].licence.name, self.licence.name)
 
         # Template context
         context = self.get_practical_plugin_context()
 
         # Get generated html for licence name
-        html = context["cms_content_renderer"].render_plugin(model_instance, {})
+        html = context["cms_content_renderer"].render_plugin(self.model_instance, {})
 
         # Check rendered name
-        self.assertIn(licence.name, html)
+        self.assertIn(self.licence.name, html)
 
-    @transaction.atomic
     def test_licence_plugin_header_level(self):
         """
         Header level can be changed from context variable 'header_level'.
         """
-        # We deliberately use level '10' since it can be substituted from any
-        # reasonable default level.
-        header_format = """<h10 class="licence-plugin__title">{}</h10>"""
-
-        # Dummy slot where to include plugin
-        placeholder = Placeholder.objects.create(slot="test")
-
-        # Create random values for parameters with a factory, empty url to
-        # simplify render of tested HTML
-        licence = LicenceFactory(url="")
-
         # Template context with additional variable to define a custom header
         # level for header markup
         context = self.get_practical_plugin_context({"header_level": 10})
 
-        add_plugin(placeholder, LicencePlugin, "en", licence=licence)
-
         # Render placeholder so plugin is fully rendered in real situation
         html = context["cms_content_renderer"].render_placeholder(
-            placeholder, context=context, language="en"
+            self.placeholder_without_url, context=context, language="en"
         )
 
-        expected_header = header_format.format(licence.name)
+        # We deliberately use level '10' since it can be substituted from any
+        # reasonable default level.
+        expected_header = (
+            f'<h10 class="licence-plugin__title">{self.licence_without_url.name}</h10>'
+        )
 
         # Expected header markup should match given 'header_level' context
         # variable
         self.assertInHTML(expected_header, html)
 
-    @transaction.atomic
     def test_licence_plugin_rdfa_property_default_with_url(self):
         """
         The RDFa licence property should be present by default on the url if any.
         """
-        # Dummy slot where to include plugin
-        placeholder = Placeholder.objects.create(slot="test")
-
-        licence = LicenceFactory(url="https://example.com")
-
         context = self.get_practical_plugin_context({})
-        add_plugin(placeholder, LicencePlugin, "en", licence=licence)
 
         # Render placeholder so plugin is fully rendered in real situation
         html = context["cms_content_renderer"].render_placeholder(
-            placeholder, context=context, language="en"
+            self.placeholder, context=context, language="en"
         )
 
         # RDFa markup should be present by default
@@ -103,24 +102,16 @@ class LicencePluginTestCase(CMSPluginTestCase):
             html.count('<a href="https://example.com" property="license">'), 1
         )
 
-    @transaction.atomic
     def test_licence_plugin_rdfa_property_activated_no_url(self):
         """
         The RDFa licence property is tagged on the content if there is no url.
         """
-        # Dummy slot where to include plugin
-        placeholder = Placeholder.objects.create(slot="test")
-
-        # Create a license with no url
-        licence = LicenceFactory(url="")
-
         # Template context with additional variable to activate license property
         context = self.get_practical_plugin_context({"is_license_property": True})
-        add_plugin(placeholder, LicencePlugin, "en", licence=licence)
 
         # Render placeholder so plugin is fully rendered in real situation
         html = context["cms_content_renderer"].render_placeholder(
-            placeholder, context=context, language="en"
+            self.placeholder_without_url, context=context, language="en"
         )
 
         # RDFa markup should be present but on the content
@@ -129,24 +120,16 @@ class LicencePluginTestCase(CMSPluginTestCase):
             html.count('<div class="licence-plugin__content" property="license">'), 1
         )
 
-    @transaction.atomic
     def test_licence_plugin_rdfa_property_deactivated(self):
         """
         The RDFa licence property can be deactivated from context variable 'is_license_property'.
         """
-        # Dummy slot where to include plugin
-        placeholder = Placeholder.objects.create(slot="test")
-
-        # Create random values for parameters with a factory
-        licence = LicenceFactory()
-
         # Template context with additional variable to deactivate license property
         context = self.get_practical_plugin_context({"is_license_property": False})
-        add_plugin(placeholder, LicencePlugin, "en", licence=licence)
 
         # Render placeholder so plugin is fully rendered in real situation
         html = context["cms_content_renderer"].render_placeholder(
-            placeholder, context=context, language="en"
+            self.placeholder, context=context, language="en"
         )
 
         # RDFa markup should not be present
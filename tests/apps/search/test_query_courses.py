@@ -45,6 +45,82 @@ class CourseRunsCoursesQueryTestCase(TestCase):
     works as expected.
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create the Elasticsearch indices and scripts that don't change from one test to
+        another once for all the tests of this class.
+
+        Elasticsearch is set up before calling the parent method: if it fails, Django's
+        class-level transactions are not opened yet so they can't be left dangling.
+        """
+        # Delete the indices we are about to use so we get a clean slate. Richie indices
+        # are matched with a wildcard because other tests may have left timestamped
+        # indices behind an alias of the same name, and aliases can't be deleted by name.
+        ES_INDICES_CLIENT.delete(
+            index=["richie_*", "test_courses"], ignore_unavailable=True
+        )
+
+        # unittest doesn't call "tearDownClass" when "setUpClass" fails, so make sure we
+        # don't leave half-configured indices behind
+        try:
+            for index, mapping in [
+                # Create an index for our categories
+                ("richie_categories", CategoriesIndexer.mapping),
+                # Create an index for our organizations
+                ("richie_organizations", OrganizationsIndexer.mapping),
+                # Create an index for our persons
+                ("richie_persons", PersonsIndexer.mapping),
+            ]:
+                cls.create_index(index, mapping)
+
+            # Add the sorting script
+            ES_CLIENT.put_script(id="score", body=CoursesIndexer.scripts["score"])
+            ES_CLIENT.put_script(
+                id="state_field", body=CoursesIndexer.scripts["state_field"]
+            )
+        except Exception:
+            cls.delete_indices()
+            raise
+
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Delete the indices created for this class: periodic refresh is disabled on them,
+        which would surprise subsequent tests writing to indices of the same name.
+        """
+        super().tearDownClass()
+        cls.delete_indices()
+
+    @staticmethod
+    def create_index(index, mapping):
+        """Create an index with our analysis settings and the mapping passed in argument."""
+        ES_INDICES_CLIENT.create(index=index)
+        ES_INDICES_CLIENT.close(index=index)
+        # Documents are only searched after the explicit refresh that follows their
+        # bulk insert, so there is no need for periodic refreshes
+        ES_INDICES_CLIENT.put_settings(
+            body={**ANALYSIS_SETTINGS, "refresh_interval": "-1"}, index=index
+        )
+        ES_INDICES_CLIENT.open(index=index)
+        ES_INDICES_CLIENT.put_mapping(body=mapping, index=index)
+
+    @staticmethod
+    def delete_indices():
+        """Delete all the indices used by the tests of this class."""
+        ES_INDICES_CLIENT.delete(
+            index=[
+                "richie_categories",
+                "richie_organizations",
+                "richie_persons",
+                "richie_licences",
+                "test_courses",
+            ],
+            ignore_unavailable=True,
+        )
+
     def setUp(self):
         """Reset indexable filters cache before each test so the context is as expected."""
         super().setUp()
@@ -85,13 +161,15 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         """
         Compute the expected course ids from the course run ids.
         """
+        # Rank course runs according to their position in the expected sequence
+        # > {"D": 0, "H": 1, "I": 2}
+        ranks = {id: rank for rank, id in enumerate(course_run_ids)}
+
         # Remove courses that don't have archived course runs
         # > [[3, ["I", "E"]], [2, ["H", "F"]]]
-        filtered_courses = list(
-            filter(
-                lambda o: any((id in course_run_ids for id in o[1])), courses_definition
-            )
-        )
+        filtered_courses = [
+            o for o in courses_definition if not ranks.keys().isdisjoint(o[1])
+        ]
 
         # Sort our courses according to the ranking of their open course runs:
         # > [[2, ["H", "F"]], [3, ["I", "E"]]]
@@ -102,14 +180,12 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         #   [[2, ["I", "E"]], [3, ["H", "F"]]]
         sorted_courses = sorted(
             filtered_courses,
-            key=lambda o: min(
-                course_run_ids.index(id) for id in o[1] if id in course_run_ids
-            ),
+            key=lambda o: min(ranks[id] for id in o[1] if id in ranks),
         )
 
         # Extract the expected list of courses
         # > [1, 3, 0]
-        return list(list(zip(*sorted_courses))[0])
+        return [o[0] for o in sorted_courses]
 
     def prepare_indices(self, suite=None):
         """
@@ -117,7 +193,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         This method is doing the heavy lifting for the tests in this class:
         - create relevant objects that will be linked with courses,
         - generate a set of courses randomly associated to our "interesting" course runs,
-        - prepare the Elasticsearch index.
+        - fill the Elasticsearch indices.
         """
         # pylint: disable=too-many-locals
         now = arrow.utcnow()
@@ -441,8 +517,12 @@ class CourseRunsCoursesQueryTestCase(TestCase):
 
         # Shuffle and group our course runs to assign them randomly to 4 courses
         # For example: [["I", "E", "C"], ["D", "G"], ["B", "A"], ["H", "F"]]
+        # The shuffle is seeded with the name of the test so that each test always gets
+        # the same suite and a failure can be reproduced.
         if not suite:
-            shuffled_runs = random.sample(list(course_runs), len(course_runs))
+            shuffled_runs = random.Random(self._testMethodName).sample(
+                list(course_runs), len(course_runs)
+            )
             suite = [shuffled_runs[i::4] for i in range(4)]
 
         # Associate groups of course runs to each course
@@ -450,51 +530,27 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         self.assertEqual(len(suite), 4)
         courses_definition = [[i, suite[i]] for i in range(4)]
 
-        # Delete any existing indices so we get a clean slate
-        ES_INDICES_CLIENT.delete(index="_all")
-
-        # Create an index for our categories
-        ES_INDICES_CLIENT.create(index="richie_categories")
-        ES_INDICES_CLIENT.close(index="richie_categories")
-        ES_INDICES_CLIENT.put_settings(
-            body=ANALYSIS_SETTINGS, index="richie_categories"
-        )
-        ES_INDICES_CLIENT.open(index="richie_categories")
-        ES_INDICES_CLIENT.put_mapping(
-            body=CategoriesIndexer.mapping, index="richie_categories"
-        )
-
-        # Create an index for our organizations
-        ES_INDICES_CLIENT.create(index="richie_organizations")
-        ES_INDICES_CLIENT.close(index="richie_organizations")
-        ES_INDICES_CLIENT.put_settings(
-            body=ANALYSIS_SETTINGS, index="richie_organizations"
-        )
-        ES_INDICES_CLIENT.open(index="richie_organizations")
-        ES_INDICES_CLIENT.put_mapping(
-            body=OrganizationsIndexer.mapping, index="richie_organizations"
-        )
-
-        # Create an index for our persons
-        ES_INDICES_CLIENT.create(index="richie_persons")
-        ES_INDICES_CLIENT.close(index="richie_persons")
-        ES_INDICES_CLIENT.put_settings(body=ANALYSIS_SETTINGS, index="richie_persons")
-        ES_INDICES_CLIENT.open(index="richie_persons")
-        ES_INDICES_CLIENT.put_mapping(
-            body=PersonsIndexer.mapping, index="richie_persons"
-        )
-
-        # Create an index we'll use to test the ES features
-        ES_INDICES_CLIENT.create(index="test_courses")
-        ES_INDICES_CLIENT.close(index="test_courses")
-        ES_INDICES_CLIENT.put_settings(body=ANALYSIS_SETTINGS, index="test_courses")
-        ES_INDICES_CLIENT.open(index="test_courses")
-        # Use the default courses mapping from the Indexer
-        ES_INDICES_CLIENT.put_mapping(body=CoursesIndexer.mapping, index="test_courses")
-        # Add the sorting script
-        ES_CLIENT.put_script(id="score", body=CoursesIndexer.scripts["score"])
-        ES_CLIENT.put_script(
-            id="state_field", body=CoursesIndexer.scripts["state_field"]
+        # Create a fresh index we'll use to test the ES features, with the default
+        # courses mapping from the Indexer. Emptying it would not be enough: deleted
+        # documents still count in term statistics until their segments are merged,
+        # which would make scores depend on the tests that ran before.
+        ES_INDICES_CLIENT.delete(index="test_courses", ignore_unavailable=True)
+        self.create_index("test_courses", CoursesIndexer.mapping)
+
+        # Other indices created in "setUpClass" are only used for their documents, not
+        # for scoring, so emptying them is enough to get a clean slate. The licences
+        # index is created on the fly by the bulk insert of the first test.
+        ES_CLIENT.delete_by_query(
+            index=[
+                "richie_categories",
+                "richie_organizations",
+                "richie_persons",
+                "richie_licences",
+            ],
+            body={"query": {"match_all": {}}},
+            conflicts="proceed",
+            ignore_unavailable=True,
+            refresh=True,
         )
 
         # Actually insert our courses in the index
@@ -545,7 +601,8 @@ class CourseRunsCoursesQueryTestCase(TestCase):
                             course_runs[course_run_id]
                             for course_run_id in course_run_ids
                         ],
-                        key=lambda o: now - o["end"],
+                        key=lambda o: o["end"],
+                        reverse=True,
                     ),
                 }
                 for course_id, course_run_ids in courses_definition
@@ -1039,7 +1096,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((o["state"] for o in response.json()["objects"])),
+            [o["state"] for o in response.json()["objects"]],
             [
                 {
                     "call_to_action": "enroll now",
@@ -1091,17 +1148,29 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             ],
         )
 
-    def test_query_courses_course_runs_filter_open_courses(self, *_):
+    def test_query_courses_course_runs_filter_availability(self, *_):
         """
-        Battle test filtering and sorting open courses.
+        Battle test filtering and sorting courses on each availability.
+        All availabilities are queried against the same indexed courses.
         """
         data = self.prepare_indices()
-        response = self.client.get("/api/v1.0/courses/?availability=open")
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
-            self.get_expected_courses(data["courses_definition"], ["A", "B", "C", "D"]),
-        )
+        for availability, course_run_ids in [
+            ("open", ["A", "B", "C", "D"]),
+            ("ongoing", ["A", "B", "F", "G"]),
+            ("coming_soon", ["C", "E"]),
+            ("archived", ["D", "H", "I"]),
+        ]:
+            with self.subTest(availability=availability):
+                response = self.client.get(
+                    f"/api/v1.0/courses/?availability={availability}"
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    [int(c["id"]) for c in response.json()["objects"]],
+                    self.get_expected_courses(
+                        data["courses_definition"], course_run_ids
+                    ),
+                )
 
     def test_query_courses_match_all_scope_objects(self, *_):
         """
@@ -1137,7 +1206,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/?availability=open")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((o["state"] for o in response.json()["objects"])),
+            [o["state"] for o in response.json()["objects"]],
             [
                 {
                     "call_to_action": "enroll now",
@@ -1244,42 +1313,6 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             ],
         )
 
-    def test_query_courses_course_runs_filter_ongoing_courses(self, *_):
-        """
-        Battle test filtering and sorting ongoing courses.
-        """
-        data = self.prepare_indices()
-        response = self.client.get("/api/v1.0/courses/?availability=ongoing")
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
-            self.get_expected_courses(data["courses_definition"], ["A", "B", "F", "G"]),
-        )
-
-    def test_query_courses_course_runs_filter_coming_soon_courses(self, *_):
-        """
-        Battle test filtering and sorting coming soon courses.
-        """
-        data = self.prepare_indices()
-        response = self.client.get("/api/v1.0/courses/?availability=coming_soon")
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
-            self.get_expected_courses(data["courses_definition"], ["C", "E"]),
-        )
-
-    def test_query_courses_course_runs_filter_archived_courses(self, *_):
-        """
-        Battle test filtering and sorting archived courses.
-        """
-        data = self.prepare_indices()
-        response = self.client.get("/api/v1.0/courses/?availability=archived")
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
-            self.get_expected_courses(data["courses_definition"], ["D", "H", "I"]),
-        )
-
     def test_query_courses_course_runs_filter_language(self, *_):
         """
         Battle test filtering and sorting courses in one language.
@@ -1288,7 +1321,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/?languages=fr")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(data["courses_definition"], ["A", "E", "G"]),
         )
 
@@ -1306,7 +1339,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/?languages=fr")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((o["state"] for o in response.json()["objects"])),
+            [o["state"] for o in response.json()["objects"]],
             [
                 {
                     "call_to_action": "enroll now",
@@ -1430,7 +1463,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/?languages=fr&languages=de")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(data["courses_definition"], ["A", "E", "G", "I"]),
         )
 
@@ -1444,7 +1477,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(data["courses_definition"], ["B", "F"]),
         )
 
@@ -1464,7 +1497,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            list((o["state"] for o in response.json()["objects"])),
+            [o["state"] for o in response.json()["objects"]],
             [
                 {
                     "call_to_action": "enroll now",
@@ -1583,7 +1616,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 1], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1596,7 +1629,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         courses_definition = filter(lambda c: c[0] == 1, data["courses_definition"])
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1609,7 +1642,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         courses_definition = filter(lambda c: c[0] == 3, data["courses_definition"])
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1627,7 +1660,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 1], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
         self.assertEqual(
@@ -1668,7 +1701,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 1, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1716,7 +1749,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [2, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
         self.assertEqual(
@@ -1764,7 +1797,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 2, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1840,7 +1873,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 1], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1863,7 +1896,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 1, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1941,7 +1974,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 2], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1964,7 +1997,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 2, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -1997,7 +2030,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
             lambda c: c[0] in [0, 3], data["courses_definition"]
         )
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -2013,9 +2046,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         response = self.client.get("/api/v1.0/courses/?query=artificial")
         self.assertEqual(response.status_code, 200)
         # Keep only the courses that contain the word "artificial"
-        self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])), [0, 3, 2]
-        )
+        self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [0, 3, 2])
 
     def test_query_courses_text_language_analyzer_with_filter_category(self, *_):
         """
@@ -2032,7 +2063,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         # Keep only the courses that are linked to category one and contain the word "artificial"
         courses_definition = filter(lambda c: c[0] in [0], data["courses_definition"])
         self.assertEqual(
-            list((int(c["id"]) for c in response.json()["objects"])),
+            [int(c["id"]) for c in response.json()["objects"]],
             self.get_expected_courses(courses_definition, list(data["course_runs"])),
         )
 
@@ -2042,9 +2073,7 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         for query in ["3rs", "3rst", "03rst", "003rst"]:
             response = self.client.get(f"/api/v1.0/courses/?query={query:s}")
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(
-                list((int(c["id"]) for c in response.json()["objects"])), [2]
-            )
+            self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [2])
 
     def test_query_courses_code_fuzzy(self, *_):
         """Full-text search should match codes with automatic fuzziness."""
@@ -2053,30 +2082,24 @@ class CourseRunsCoursesQueryTestCase(TestCase):
         for query in ["7rs", "3dst", "13rst", "003rsg"]:
             response = self.client.get(f"/api/v1.0/courses/?query={query:s}")
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(
-                list((int(c["id"]) for c in response.json()["objects"])), [2]
-            )
+            self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [2])
 
         # A Levenshtein distance of 2 matches only for search queries of at least 5 characters
         for query in ["7ds", "3det", "14rst"]:
             response = self.client.get(f"/api/v1.0/courses/?query={query:s}")
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(
-                list((int(c["id"]) for c in response.json()["objects"])), []
-            )
+            self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [])
 
         response = self.client.get("/api/v1.0/courses/?query=003rfg")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(list((int(c["id"]) for c in response.json()["objects"])), [2])
+        self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [2])
 
         # A Levenshtein distance of 3 doesn't match for search queries of 5 characters
         # (we could test for longer queries...)
         for query in ["7de", "3def", "14dst", "003efg"]:
             response = self.client.get(f"/api/v1.0/courses/?query={query:s}")
             self.assertEqual(response.status_code, 200)
-            self.assertEqual(
-                list((int(c["id"]) for c in response.json()["objects"])), []
-            )
+            self.assertEqual([int(c["id"]) for c in response.json()["objects"]], [])
 
     def test_query_courses_children_aggs_over_aggs_list(self, *_):
         """